@@ -4,25 +4,32 @@ from stable_baselines3 import PPO
 # Assuming 'quantum_routing_gym' handles the 'gymnasium' import internally or is designed for the new API.
 from quantum_routing_gym import QuantumRoutingGym 
 
-env = QuantumRoutingGym(noise_level=0.05, ec="purify_double")
-model = PPO.load("ppo_quantum_router_5percent")   # from earlier training
+MODEL_PATH = "ppo_quantum_router_5percent"   # from earlier training
 
-success = 0
-for _ in range(500):
-    # CHANGED: env.reset() now returns (observation, info)
-    obs, _ = env.reset() 
-    terminated = False # Initialize terminated flag
-    truncated = False  # Initialize truncated flag
+def main(model_path=MODEL_PATH, noise=0.05, ec="purify_double", trials=500):
+    env = QuantumRoutingGym(noise_level=noise, ec=ec)
+    model = PPO.load(model_path)
 
-    while not (terminated or truncated): # CHANGED: Loop while neither is True
-        action, _ = model.predict(obs, deterministic=True)
+    success = 0
+    for _ in range(trials):
+        # CHANGED: env.reset() now returns (observation, info)
+        obs, _ = env.reset() 
+        terminated = False # Initialize terminated flag
+        truncated = False  # Initialize truncated flag
+
+        while not (terminated or truncated): # CHANGED: Loop while neither is True
+            action, _ = model.predict(obs, deterministic=True)
+            
+            # CHANGED: env.step() now returns 5 values: obs, reward, terminated, truncated, info
+            obs, _, terminated, truncated, info = env.step(action) 
+            
+        # The original logic used 'done', we combine terminated and truncated here if needed elsewhere, 
+        # but the loop condition is updated.
         
-        # CHANGED: env.step() now returns 5 values: obs, reward, terminated, truncated, info
-        obs, _, terminated, truncated, info = env.step(action) 
+        success += info.get("final_fidelity", 0) >= 0.8
         
-    # The original logic used 'done', we combine terminated and truncated here if needed elsewhere, 
-    # but the loop condition is updated.
-    
-    success += info.get("final_fidelity", 0) >= 0.8
-    
-print(f"PPO success rate (500 trials): {success/500:.4f}")
+    print(f"PPO success rate ({trials} trials): {success/trials:.4f}")
+    return success / trials
+
+if __name__ == "__main__":
+    main()
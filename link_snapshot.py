@@ -0,0 +1,243 @@
+# link_snapshot.py
+# Dense (episodes × links) link-fidelity snapshots in shared memory or a memory-mapped
+# .npy file, evaluated by worker processes that attach zero-copy
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List
+
+import numpy as np
+
+from qunet_env_mesh9 import QNetMesh9
+from policy_cache import PolicyCache
+
+GREEDY_POLICIES = ["shortest", "hybrid_rule", "highest_fidelity"]
+DTYPE = np.float32   # 4 bytes/link; clean links all hold float32(F_clean), so they stay exactly equal
+
+
+class LinkSnapshot:
+    """
+    Row i = fidelity of every mesh link (QNetMesh9.links order) in episode i.
+    The topology descriptor (nodes, links, src/dst, noise, clean-link value) travels
+    with the array; workers receive only `descriptor` and map the data in place.
+    """
+
+    def __init__(self, array: np.ndarray, meta: Dict[str, Any], shm=None, path=None, owner=False):
+        self.array = array
+        self.meta = meta
+        self._shm = shm
+        self.path = path
+        self._owner = owner
+
+    # ---------------------------------------------------------------- creation
+    @classmethod
+    def create(cls, episodes: int, noise_level: float, seed: int = 0, path: str = None,
+               src="N1", dst="N9", chunk: int = 1_000_000) -> "LinkSnapshot":
+        """Sample `episodes` link states into shared memory (or a .npy memmap if `path`)"""
+        env = QNetMesh9()
+        env.reset(src=src, dst=dst, noise_level=noise_level)
+        meta = {
+            "topology": "mesh9", "nodes": env.nodes, "links": [list(l) for l in env.links],
+            "src": src, "dst": dst, "noise_level": noise_level,
+            "F_clean": env.F_clean, "seed": seed,   # unrounded; stored rows hold DTYPE(F_clean)
+        }
+        shape = (episodes, len(env.links))
+        if path is None:
+            nbytes = max(1, int(np.prod(shape)) * np.dtype(DTYPE).itemsize)
+            shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            array = np.ndarray(shape, dtype=DTYPE, buffer=shm.buf)
+            snap = cls(array, meta, shm=shm, owner=True)
+        else:
+            array = np.lib.format.open_memmap(path, mode="w+", dtype=DTYPE, shape=shape)
+            with open(path + ".json", "w") as f:
+                json.dump(meta, f)
+            snap = cls(array, meta, path=path, owner=True)
+
+        # Same per-link model as QNetMesh9._sample_link, vectorised in chunks
+        rng = np.random.RandomState(seed)
+        for start in range(0, episodes, chunk):
+            stop = min(start + chunk, episodes)
+            dep = rng.random_sample((stop - start, shape[1])) < noise_level
+            vals = rng.uniform(0.30, 0.55, size=(stop - start, shape[1]))
+            array[start:stop] = np.where(dep, vals, env.F_clean)
+        if path is not None:
+            array.flush()
+        return snap
+
+    @classmethod
+    def open(cls, path: str) -> "LinkSnapshot":
+        """Map an existing .npy snapshot read-only"""
+        with open(path + ".json") as f:
+            meta = json.load(f)
+        return cls(np.load(path, mmap_mode="r"), meta, path=path)
+
+    # ---------------------------------------------------------------- sharing
+    @property
+    def descriptor(self) -> Dict[str, Any]:
+        """Small picklable handle; everything a worker needs to attach"""
+        d = {"shape": self.array.shape, "dtype": np.dtype(self.array.dtype).str, "meta": self.meta}
+        if self._shm is not None:
+            d["shm_name"] = self._shm.name
+        else:
+            d["path"] = self.path
+        return d
+
+    @classmethod
+    def attach(cls, descriptor: Dict[str, Any]) -> "LinkSnapshot":
+        if "shm_name" in descriptor:
+            shm = shared_memory.SharedMemory(name=descriptor["shm_name"])
+            array = np.ndarray(descriptor["shape"], dtype=descriptor["dtype"], buffer=shm.buf)
+            array.flags.writeable = False
+            return cls(array, descriptor["meta"], shm=shm)
+        return cls(np.load(descriptor["path"], mmap_mode="r"), descriptor["meta"],
+                   path=descriptor["path"])
+
+    def close(self):
+        """Release this process's mapping; the owner also frees the shared segment"""
+        self.array = None
+        if self._shm is not None:
+            self._shm.close()
+            if self._owner:
+                self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.array.shape[0]
+
+
+# -------------------------------------------------------------------- policies
+def ppo_path(model_path: str, noise_level: float, ec: str, max_steps: int = 16) -> List[str]:
+    """
+    Deterministic PPO route. The agent observes only current node, target and noise level,
+    so its path is the same for every link state and is computed once, in the parent.
+    Returns [] for an invalid move or a walk that never reaches the target.
+    """
+    from stable_baselines3 import PPO
+    from quantum_routing_gym import QuantumRoutingGym
+
+    env = QuantumRoutingGym(noise_level=noise_level, ec=ec)
+    model = PPO.load(model_path)
+    obs, _ = env.reset(seed=0)
+    for _ in range(max_steps):
+        action, _ = model.predict(obs, deterministic=True)
+        obs, _, terminated, truncated, info = env.step(action)
+        if terminated or truncated:
+            return [] if info.get("notes") == "invalid move" else list(env.path)
+    return []
+
+
+# -------------------------------------------------------------------- workers
+_W: Dict[str, Any] = {}
+
+
+def _init_worker(descriptor, policies, ec, fixed_ppo_path, policy_cache_size):
+    snap = LinkSnapshot.attach(descriptor)
+    meta = snap.meta
+    _W.update(snap=snap, policies=policies, ec=ec, src=meta["src"], dst=meta["dst"],
+              noise=meta["noise_level"],
+              clean=float(snap.array.dtype.type(meta["F_clean"])),   # F_clean as stored
+              env=QNetMesh9(policy_cache=PolicyCache(policy_cache_size) if policy_cache_size else None),
+              ppo_path=fixed_ppo_path)
+
+
+def _eval_range(bounds):
+    """Evaluate rows [start, stop) for every policy; return compact arrays + local path table"""
+    start, stop = bounds
+    env, ec = _W["env"], _W["ec"]
+    n = stop - start
+    paths: Dict[str, int] = {}
+    out = {}
+    for pol in _W["policies"]:
+        fid = np.zeros(n, dtype=np.float32)
+        hops = np.zeros(n, dtype=np.int8)
+        pid = np.zeros(n, dtype=np.int32)
+        fixed = _W.get("ppo_path") if pol == "ppo" else None
+        for i, row in enumerate(_W["snap"].array[start:stop].tolist()):
+            env.reset(src=_W["src"], dst=_W["dst"], noise_level=_W["noise"])
+            env.load_link_state(row, F_clean=_W["clean"])
+            if pol == "ppo" and not fixed:
+                res = {"final_fidelity": 0.0, "notes": "invalid"}
+            else:
+                res = env.run_episode(pol, ec, path=fixed)
+            fid[i] = res["final_fidelity"]
+            hops[i] = res.get("num_hops", 0)
+            pid[i] = paths.setdefault(res.get("path_taken", "invalid"), len(paths))
+        out[pol] = (fid, hops, pid)
+    return start, out, list(paths)
+
+
+def evaluate_snapshot(snap: LinkSnapshot, policies: List[str] = GREEDY_POLICIES,
+                      ec: str = "purify_double", workers: int = None, chunk: int = 20_000,
+                      model_path: str = "ppo_quantum_router_5percent",
+                      policy_cache_size: int = 4096) -> Dict[str, Any]:
+    """
+    Evaluate `policies` on every snapshot row. workers=0 runs in-process.
+    Returns {policy: {"final_fidelity", "num_hops", "success", "path_id"}, "paths": [...]}
+    with one entry per episode; path_id indexes the shared "paths" table.
+    """
+    unknown = [pol for pol in policies if pol not in GREEDY_POLICIES + ["ppo"]]
+    if unknown:
+        raise ValueError(f"unknown policies {unknown}; expected {GREEDY_POLICIES + ['ppo']}")
+    if "ppo" in policies and (snap.meta["src"], snap.meta["dst"]) != ("N1", "N9"):
+        # QuantumRoutingGym always routes N1→N9, so its path means nothing for other pairs
+        raise ValueError(f"ppo only routes N1→N9, snapshot is {snap.meta['src']}→{snap.meta['dst']}")
+    n = len(snap)
+    results = {pol: {"final_fidelity": np.zeros(n, dtype=np.float32),
+                     "num_hops": np.zeros(n, dtype=np.int8),
+                     "path_id": np.zeros(n, dtype=np.int32)} for pol in policies}
+    table: Dict[str, int] = {}
+    bounds = [(s, min(s + chunk, n)) for s in range(0, n, chunk)]
+    # Resolve the PPO route here so workers never import torch/SB3 or load the model
+    fixed = ppo_path(model_path, snap.meta["noise_level"], ec) if "ppo" in policies else None
+    initargs = (snap.descriptor, list(policies), ec, fixed, policy_cache_size)
+
+    def merge(start, out, local_paths):
+        remap = np.array([table.setdefault(p, len(table)) for p in local_paths], dtype=np.int32)
+        for pol, (fid, hops, pid) in out.items():
+            stop = start + len(fid)
+            results[pol]["final_fidelity"][start:stop] = fid
+            results[pol]["num_hops"][start:stop] = hops
+            results[pol]["path_id"][start:stop] = remap[pid] if len(remap) else pid
+
+    if workers == 0:
+        _init_worker(*initargs)
+        try:
+            for b in bounds:
+                merge(*_eval_range(b))
+        finally:
+            _W.pop("snap").close()
+            _W.clear()
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 initializer=_init_worker, initargs=initargs) as pool:
+            for res in pool.map(_eval_range, bounds):
+                merge(*res)
+
+    for pol in policies:
+        results[pol]["success"] = results[pol]["final_fidelity"] >= 0.8
+    results["paths"] = list(table)
+    return results
+
+
+def summarize(results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Per-policy success rate, mean fidelity, mean hops and most common path"""
+    summary = {}
+    for pol, r in results.items():
+        if pol == "paths":
+            continue
+        counts = np.bincount(r["path_id"], minlength=len(results["paths"]))
+        summary[pol] = {
+            "episodes": len(r["success"]),
+            "success_rate": round(float(r["success"].mean()), 4),
+            "mean_fidelity": round(float(r["final_fidelity"].mean()), 5),
+            "mean_hops": round(float(r["num_hops"].mean()), 3),
+            "most_common_path": results["paths"][int(counts.argmax())] if len(counts) else "",
+        }
+    return summary
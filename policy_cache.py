@@ -0,0 +1,49 @@
+# policy_cache.py
+# Bounded LRU cache for routing-policy decisions (path per link-state signature)
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List
+
+
+class PolicyCache:
+    """
+    LRU map: signature → path. Signatures come from QNetMesh9.link_state_signature(),
+    so two episodes with the same depolarization pattern (and the same ranking of the
+    depolarized links) share one greedy walk.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._paths: "OrderedDict[Hashable, List[str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], List[str]]) -> List[str]:
+        path = self._paths.get(key)
+        if path is not None:
+            self._paths.move_to_end(key)
+            self.hits += 1
+            return list(path)
+        self.misses += 1
+        path = compute()
+        if self.maxsize > 0:
+            self._paths[key] = list(path)
+            if len(self._paths) > self.maxsize:
+                self._paths.popitem(last=False)
+                self.evictions += 1
+        return path
+
+    def clear(self):
+        self._paths.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "size": len(self._paths), "maxsize": self.maxsize,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._paths)
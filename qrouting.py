@@ -0,0 +1,318 @@
+# qrouting.py
+# Single entry point for sweeps, RL training/eval, analysis, plots and benchmarks.
+# Only stdlib is imported at module top: numpy / gymnasium / torch / SB3 / pandas /
+# matplotlib are imported inside the subcommand that needs them, so a sweep shard
+# never pays for the RL or plotting stack.
+import time
+_T0 = time.perf_counter()
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+if str(HERE) not in sys.path:
+    sys.path.insert(0, str(HERE))
+
+PLOT_SCRIPTS = {
+    "paths": "plot_paths.py",
+    "success-bar": "custom_success_bar.py",
+    "tradeoff-table": "custom_tradeoff_table.py",
+}
+
+# Import groups timed by `qrouting bench` (name → import statement)
+IMPORT_STACKS = {
+    "cli": "import qrouting",
+    "sim": "import qunet_env_mesh9",
+    "gym": "import quantum_routing_gym",
+    "rl": "import torch, stable_baselines3",
+    "plot": "import pandas, matplotlib.pyplot, seaborn",
+}
+
+
+def _csv_list(cast):
+    return lambda s: [cast(x) for x in s.split(",") if x]
+
+
+# Mirrors link_snapshot.GREEDY_POLICIES + ["ppo"]; kept here so parsing stays numpy-free
+SNAPSHOT_POLICIES = ["shortest", "hybrid_rule", "highest_fidelity", "ppo"]
+
+
+def _policy_list(s):
+    pols = _csv_list(str)(s)
+    unknown = [p for p in pols if p not in SNAPSHOT_POLICIES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown policies {', '.join(unknown)} (choose from {', '.join(SNAPSHOT_POLICIES)})")
+    return pols
+
+
+def _shard(s):
+    # "k/n" with 1-based k, as batch schedulers usually number array tasks
+    k, n = (int(x) for x in s.split("/"))
+    if not 1 <= k <= n:
+        raise argparse.ArgumentTypeError(f"shard must be k/n with 1 <= k <= n, got {s}")
+    return k - 1, n
+
+
+# ---------------------------------------------------------------------------
+# Subcommands
+# ---------------------------------------------------------------------------
+def cmd_sweep(args):
+    if args.topology == "mesh9":
+        import run_mesh_experiments as runner
+        defaults = dict(outfile=runner.OUTFILE, noise_levels=runner.NOISE_LEVELS,
+                        ec_modes=runner.EC, trials=runner.TRIALS, seed_base=runner.SEED_BASE)
+    else:
+        import run_small_experiments_fixed as runner
+        defaults = dict(outfile=runner.OUTFILE, noise_levels=runner.NOISE_LEVELS,
+                        ec_modes=runner.ERROR_CORRECTIONS, trials=runner.TRIALS_PER_CONFIG,
+                        seed_base=runner.SEED_BASE)
+    shard, num_shards = args.shard
+    if num_shards > 1 and not args.out:
+        # Never let partial, interleaved shard rows land in the committed thesis CSVs
+        sys.exit("qrouting sweep: --out is required with --shard")
+    runner.main(
+        outfile=args.out or defaults["outfile"],
+        noise_levels=args.noise or defaults["noise_levels"],
+        ec_modes=args.ec or defaults["ec_modes"],
+        policies=args.policy or runner.POLICIES,
+        trials=args.trials if args.trials is not None else defaults["trials"],
+        seed_base=args.seed_base if args.seed_base is not None else defaults["seed_base"],
+        shard=shard, num_shards=num_shards,
+    )
+
+
+def cmd_train(args):
+    import train_rl_agent
+    train_rl_agent.main(noise=args.noise, ec=args.ec, timesteps=args.timesteps,
+                        model_path=args.model, seed=args.seed)
+
+
+def cmd_eval(args):
+    import eval_rl
+    eval_rl.main(model_path=args.model, noise=args.noise, ec=args.ec, trials=args.trials)
+
+
+def cmd_analyze(args):
+    if not args.show:
+        os.environ.setdefault("MPLBACKEND", "Agg")
+    import analyze_mesh
+    # Defaults live next to the scripts; explicit paths stay relative to the caller's cwd
+    analyze_mesh.main(infile=args.csv or HERE / analyze_mesh.INFILE,
+                      outfile=args.out or HERE / analyze_mesh.OUTFILE, show=args.show)
+
+
+def cmd_plot(args):
+    import runpy
+    if not args.show:
+        os.environ.setdefault("MPLBACKEND", "Agg")
+    # The plot scripts read and write files relative to the repo directory
+    os.chdir(HERE)
+    runpy.run_path(str(HERE / PLOT_SCRIPTS[args.figure]), run_name="__main__")
+
+
+def cmd_snapshot(args):
+    from link_snapshot import LinkSnapshot, evaluate_snapshot, summarize
+    sampling = {"--episodes": args.episodes, "--noise": args.noise, "--seed": args.seed}
+    if args.file and Path(args.file).exists():
+        given = [flag for flag, v in sampling.items() if v is not None]
+        if given:
+            sys.exit(f"qrouting snapshot: {', '.join(given)} cannot be used with existing "
+                     f"snapshot {args.file}; remove the file to resample")
+        snap = LinkSnapshot.open(args.file)
+    else:
+        t = time.perf_counter()
+        snap = LinkSnapshot.create(args.episodes if args.episodes is not None else 100_000,
+                                   args.noise if args.noise is not None else 0.05,
+                                   seed=args.seed or 0, path=args.file)
+        where = args.file or "shared memory"
+        print(f"Sampled {snap.array.size:,} links ({snap.array.nbytes/2**20:.1f} MiB) into "
+              f"{where} in {time.perf_counter()-t:.2f} s")
+    with snap:
+        t = time.perf_counter()
+        results = evaluate_snapshot(snap, policies=args.policies, ec=args.ec,
+                                    workers=args.workers, chunk=args.chunk,
+                                    model_path=args.model, policy_cache_size=args.policy_cache)
+        print(f"Evaluated {len(snap):,} episodes × {len(args.policies)} policies "
+              f"in {time.perf_counter()-t:.2f} s "
+              f"(noise={snap.meta['noise_level']}, ec={args.ec})")
+    for pol, row in summarize(results).items():
+        print(f"  {pol:<17} success {row['success_rate']:.4f}  F {row['mean_fidelity']:.4f}  "
+              f"hops {row['mean_hops']:.2f}  {row['most_common_path']}")
+    if args.out:
+        import numpy as np
+        np.savez_compressed(args.out, paths=np.array(results.pop("paths")),
+                            **{f"{pol}_{k}": v for pol, r in results.items() for k, v in r.items()})
+        print("Per-episode results →", args.out)
+
+
+def _time_import(stmt, repeat):
+    """Median wall time (s) of a fresh interpreter running `stmt`, or None if it fails."""
+    import statistics, subprocess
+    probe = ("import time; t = time.perf_counter(); " + stmt +
+             "; print(time.perf_counter() - t)")
+    samples = []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-c", probe], cwd=HERE,
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            return None
+        samples.append(float(proc.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def _time_process(argv, repeat):
+    import statistics, subprocess
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        subprocess.run([sys.executable, *argv], cwd=HERE, capture_output=True)
+        samples.append(time.perf_counter() - t)
+    return statistics.median(samples)
+
+
+def cmd_bench(args):
+    print(f"Import cost per stack (median of {args.repeat}, fresh interpreter):")
+    for name, stmt in IMPORT_STACKS.items():
+        dt = _time_import(stmt, args.repeat)
+        shown = "not installed" if dt is None else f"{dt*1000:8.1f} ms"
+        print(f"  {name:<6} {shown:>14}   ({stmt})")
+
+    cold = _time_process([str(HERE / "qrouting.py"), "--help"], args.repeat)
+    bare = _time_process(["-c", "pass"], args.repeat)
+    print(f"\nCold start `qrouting --help`: {cold*1000:.1f} ms "
+          f"(bare interpreter {bare*1000:.1f} ms, overhead {(cold-bare)*1000:.1f} ms)")
+
+    if args.episodes:
+        from qunet_env_mesh9 import QNetMesh9
+        from policy_cache import PolicyCache
+        print(f"\nMesh simulator throughput ({args.episodes} episodes, "
+              f"noise={args.noise}, ec={args.ec}):")
+        for pol in ["shortest", "hybrid_rule", "highest_fidelity"]:
+            t = time.perf_counter()
+            for i in range(args.episodes):
+                env = QNetMesh9(seed=i)
+                env.reset(noise_level=args.noise, seed=i)
+                env.run_episode(pol, args.ec, i)
+            dt = time.perf_counter() - t
+            print(f"  {pol:<17} {args.episodes/dt:10.0f} episodes/s")
+
+        # The cache only applies to pre-loaded link states (snapshot replay), so time that
+        env = QNetMesh9()
+        states = []
+        for i in range(args.episodes):
+            env.reset(noise_level=args.noise, seed=i)
+            env.sample_link_state()
+            states.append([env.link_fid[l] for l in env.links])
+        print(f"\nReplay of {args.episodes} pre-sampled link states:")
+        for pol in ["hybrid_rule", "highest_fidelity"]:
+            for cache in (None, PolicyCache(args.policy_cache)):
+                env = QNetMesh9(policy_cache=cache)
+                t = time.perf_counter()
+                for row in states:
+                    env.reset(noise_level=args.noise)
+                    env.load_link_state(row)
+                    env.run_episode(pol, args.ec)
+                dt = time.perf_counter() - t
+                note = "" if cache is None else f"  cached, hit rate {cache.stats()['hit_rate']:.3f}"
+                print(f"  {pol:<17} {args.episodes/dt:10.0f} episodes/s{note}")
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+def build_parser():
+    ap = argparse.ArgumentParser(
+        prog="qrouting",
+        description="Quantum routing experiments: sweeps, RL, analysis, plots, benchmarks.")
+    ap.add_argument("--timing", action="store_true",
+                    help="report startup and command wall time on stderr")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("sweep", help="run simulator sweep (no RL/plot imports)")
+    p.add_argument("--topology", choices=["mesh9", "linear5"], default="mesh9")
+    p.add_argument("--noise", type=_csv_list(float), help="comma-separated noise levels")
+    p.add_argument("--ec", type=_csv_list(str), help="comma-separated EC modes")
+    p.add_argument("--policy", type=_csv_list(str), help="comma-separated policies")
+    p.add_argument("--trials", type=int, help="trials per config")
+    p.add_argument("--seed-base", type=int)
+    p.add_argument("--shard", type=_shard, default=(0, 1), metavar="K/N",
+                   help="run only shard K of N (1-based); seeds match the full sweep; "
+                        "requires --out")
+    p.add_argument("--out", help="output CSV (appended; header written if missing)")
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser("train", help="train PPO agent (imports torch + SB3)")
+    p.add_argument("--noise", type=float, default=0.05)
+    p.add_argument("--ec", default="purify_double")
+    p.add_argument("--timesteps", type=int, default=1_000_000)
+    p.add_argument("--model", default="ppo_quantum_router_5percent")
+    p.add_argument("--seed", type=int, default=42)
+    p.set_defaults(func=cmd_train)
+
+    p = sub.add_parser("eval", help="evaluate PPO agent (imports torch + SB3)")
+    p.add_argument("--model", default="ppo_quantum_router_5percent")
+    p.add_argument("--noise", type=float, default=0.05)
+    p.add_argument("--ec", default="purify_double")
+    p.add_argument("--trials", type=int, default=500)
+    p.set_defaults(func=cmd_eval)
+
+    p = sub.add_parser("analyze", help="mesh summary tables + bar plot (pandas/seaborn)")
+    p.add_argument("--csv", help="results CSV (default: results_mesh9_1620.csv in the repo)")
+    p.add_argument("--out", help="figure path (default: mesh9_success_comparison.png in the repo)")
+    p.add_argument("--show", action="store_true", help="open the figure window")
+    p.set_defaults(func=cmd_analyze)
+
+    p = sub.add_parser("plot", help="render a thesis figure (matplotlib)")
+    p.add_argument("figure", choices=sorted(PLOT_SCRIPTS))
+    p.add_argument("--show", action="store_true", help="open the figure window")
+    p.set_defaults(func=cmd_plot)
+
+    p = sub.add_parser("snapshot", help="evaluate policies on a shared link-state snapshot")
+    # Sampling flags default to None so they can be rejected for an existing --file
+    p.add_argument("--episodes", type=int, help="episodes to sample (default 100000)")
+    p.add_argument("--noise", type=float, help="depolarizing probability (default 0.05)")
+    p.add_argument("--seed", type=int, help="sampling seed (default 0)")
+    p.add_argument("--file", help=".npy snapshot to map (created if missing; default: shared memory). "
+                                  "An existing file is evaluated as-is; --episodes/--noise/--seed "
+                                  "are then an error")
+    p.add_argument("--policies", type=_policy_list,
+                   default=["shortest", "hybrid_rule", "highest_fidelity"],
+                   help="comma-separated; add 'ppo' to include the RL agent (imports torch + SB3)")
+    p.add_argument("--ec", default="purify_double")
+    p.add_argument("--workers", type=int, help="worker processes (default: all CPUs, 0 = in-process)")
+    p.add_argument("--chunk", type=int, default=20_000, help="episodes per work item")
+    p.add_argument("--model", default="ppo_quantum_router_5percent")
+    p.add_argument("--policy-cache", type=int, default=4096, metavar="SIZE",
+                   help="per-worker policy cache size (0 disables)")
+    p.add_argument("--out", help="write per-episode results (.npz)")
+    p.set_defaults(func=cmd_snapshot)
+
+    p = sub.add_parser("bench", help="measure import/startup cost and simulator throughput")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--episodes", type=int, default=0,
+                   help="also time N mesh episodes per policy (imports numpy)")
+    p.add_argument("--noise", type=float, default=0.05)
+    p.add_argument("--ec", default="purify_double")
+    p.add_argument("--policy-cache", type=int, default=4096, metavar="SIZE",
+                   help="LRU size for the cached throughput run")
+    p.set_defaults(func=cmd_bench)
+    return ap
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    t_start = time.perf_counter()
+    try:
+        return args.func(args)
+    finally:
+        if args.timing:
+            print(f"[qrouting] startup {(t_start-_T0)*1000:.1f} ms, "
+                  f"{args.command} {time.perf_counter()-t_start:.3f} s",
+                  file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
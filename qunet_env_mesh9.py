@@ -4,8 +4,12 @@ from typing import List, Dict, Any
 from collections import defaultdict
 
 class QNetMesh9:
-    def __init__(self, seed: int = None):
+    F0 = 0.96  # intrinsic hardware fidelity per elementary link
+
+    def __init__(self, seed: int = None, policy_cache=None):
         self.rng = np.random.RandomState(seed)
+        # Optional PolicyCache: memoizes greedy walks on pre-loaded link states (load_link_state)
+        self.policy_cache = policy_cache
         self.nodes = [f"N{i}" for i in range(1,10)]
         pos = [(i//3, i%3) for i in range(9)]
         self.node_to_pos = dict(zip(self.nodes, pos))
@@ -22,12 +26,17 @@ class QNetMesh9:
                     if neigh != node:
                         self.adj[node].append(neigh)
 
+        # Canonical link order (20 links) → bit positions in the depolarization mask
+        self.links = sorted((u,v) for u in self.nodes for v in self.adj[u] if u < v)
+
     def reset(self, src="N1", dst="N9", noise_level=0.01, seed=None):
         if seed is not None:
             self.rng = np.random.RandomState(seed)
             random.seed(seed)
         self.src, self.dst, self.p = src, dst, noise_level
         self.link_fid = defaultdict(dict)
+        self.depolarized = set()
+        self.F_clean = self.F0 * (1-self.p) + (1-self.F0)/3
         self.stats = {
             "path_taken":"", "num_hops":0, "final_fidelity":0.0,
             "num_epr_attempts":0, "purification_rounds":0,
@@ -35,15 +44,55 @@ class QNetMesh9:
         }
 
     def _sample_link(self, u, v):
-        key = tuple(sorted([u,v]))
+        key = (u,v) if u < v else (v,u)
         if key not in self.link_fid:
-            F0 = 0.96
             if self.rng.random() < self.p:
                 self.link_fid[key] = self.rng.uniform(0.30, 0.55)
+                self.depolarized.add(key)
             else:
-                self.link_fid[key] = F0 * (1-self.p) + (1-F0)/3
+                self.link_fid[key] = self.F_clean
         return self.link_fid[key]
 
+    def sample_link_state(self):
+        """Sample every link up front, in canonical order (needed before a signature exists)"""
+        if len(self.link_fid) < len(self.links):
+            for u, v in self.links: self._sample_link(u, v)
+
+    def load_link_state(self, fids, F_clean=None):
+        """
+        Install a pre-sampled link state (one value per self.links entry); no RNG draws.
+        F_clean = value marking a clean link in `fids` if stored at lower precision
+        (e.g. float32 snapshots); defaults to self.F_clean.
+        """
+        clean = self.F_clean if F_clean is None else F_clean
+        self.link_fid = dict(zip(self.links, fids))
+        self.depolarized = {k for k, F in self.link_fid.items() if F != clean}
+
+    def _link_dist(self, u, v):
+        return sum(abs(a-b) for a,b in zip(self.node_to_pos[u], self.node_to_pos[v]))
+
+    def _link_weight(self, policy, F, dist):
+        # The per-link quantity each greedy policy maximises at every step
+        if policy == "hybrid_rule":
+            return F**3 / (dist + 0.1)
+        return F
+
+    def link_state_signature(self, policy: str):
+        """
+        Cache key for a greedy policy decision on the current (fully sampled) link state.
+        Greedy walks only compare link weights, so the path is fixed by which links are
+        depolarized plus the weight order of those links relative to each other and to the
+        clean links (one sentinel per clean weight class: -2 = orthogonal, -3 = diagonal).
+        """
+        mask = 0
+        ranked = [(-self._link_weight(policy, self.F_clean, d), -1-d) for d in (1, 2)]
+        for i, (u, v) in enumerate(self.links):
+            if (u, v) in self.depolarized:
+                mask |= 1 << i
+                ranked.append((-self._link_weight(policy, self.link_fid[(u,v)], self._link_dist(u,v)), i))
+        order = tuple(i for _, i in sorted(ranked))
+        return (policy, self.src, self.dst, mask, order)
+
     def _purify(self, F, rounds):
         for _ in range(rounds):
             if F < 0.5: break
@@ -76,7 +125,7 @@ class QNetMesh9:
             path.append(nxt); cur = nxt; visited.add(cur)
         return path
 
-    def run_episode(self, policy: str, ec: str, seed=None) -> Dict[str, Any]:
+    def run_episode(self, policy: str, ec: str, seed=None, path: List[str] = None) -> Dict[str, Any]:
         if seed is not None:
             self.rng = np.random.RandomState(seed)
             random.seed(seed)
@@ -86,7 +135,14 @@ class QNetMesh9:
             "hybrid_rule": self.hybrid_rule_policy,
             "highest_fidelity": self.highest_fidelity_policy
         }
-        path = policy_map[policy]()
+        if path is not None:
+            path = list(path)                           # externally chosen path (e.g. RL agent)
+        elif (self.policy_cache is not None and policy != "shortest"
+              and len(self.link_fid) == len(self.links)):
+            # Only on a fully loaded link state: the key is exact and no random draws change
+            path = self.policy_cache.get_or_compute(self.link_state_signature(policy), policy_map[policy])
+        else:
+            path = policy_map[policy]()
         hops = len(path)-1
         if hops == 0: return {"final_fidelity":0.0, "notes":"invalid"}
 
@@ -17,16 +17,22 @@ def ensure_header(p):
         with open(p,"w",newline="",encoding="utf-8-sig") as f:
             csv.writer(f).writerow(header)
 
-def main():
-    out = Path(OUTFILE); ensure_header(out)
-    total = len(NOISE_LEVELS)*len(EC)*len(POLICIES)*TRIALS
-    print(f"Starting {total} mesh episodes...")
-    rid = 0
-    for noise in NOISE_LEVELS:
-        for ec in EC:
-            for pol in POLICIES:
-                for trial in range(TRIALS):
-                    seed = SEED_BASE + rid
+def main(outfile=OUTFILE, noise_levels=NOISE_LEVELS, ec_modes=EC, policies=POLICIES,
+         trials=TRIALS, seed_base=SEED_BASE, shard=0, num_shards=1):
+    # Shard k of n runs every n-th episode, so run_ids and seeds match the full sweep
+    out = Path(outfile); ensure_header(out)
+    full = len(noise_levels)*len(ec_modes)*len(policies)*trials
+    total = len(range(shard, full, num_shards))   # episodes in this shard
+    print(f"Starting {total} mesh episodes (shard {shard+1}/{num_shards} of {full})...")
+    rid = done = 0
+    for noise in noise_levels:
+        for ec in ec_modes:
+            for pol in policies:
+                for trial in range(trials):
+                    if rid % num_shards != shard:
+                        rid += 1
+                        continue
+                    seed = seed_base + rid
                     env = QNetMesh9(seed=seed)
                     env.reset(noise_level=noise, seed=seed)
                     t0 = time.time()
@@ -40,9 +46,9 @@ def main():
                            success, round(wall,5)]
                     with open(out,"a",newline="",encoding="utf-8-sig") as f:
                         csv.writer(f).writerow(row)
-                    rid += 1
-                    if rid % 100 == 0: print(f"Progress: {rid}/{total}")
+                    rid += 1; done += 1
+                    if done % 100 == 0: print(f"Progress: {done}/{total}")
     print("Mesh benchmark complete →", out.resolve())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
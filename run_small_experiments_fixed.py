@@ -31,19 +31,27 @@ def ensure_header(path: Path):
         with open(path, "w", newline="") as f:
             csv.writer(f).writerow(header)
 
-def main():
-    outpath = Path(OUTFILE)
+def main(outfile=OUTFILE, noise_levels=NOISE_LEVELS, ec_modes=ERROR_CORRECTIONS,
+         policies=POLICIES, trials=TRIALS_PER_CONFIG, seed_base=SEED_BASE,
+         shard=0, num_shards=1):
+    outpath = Path(outfile)
     ensure_header(outpath)
 
     run_id = 0
-    total = len(ERROR_CORRECTIONS) * len(NOISE_LEVELS) * len(POLICIES) * TRIALS_PER_CONFIG
-    print(f"Starting {total} correct episodes...")
+    done = 0
+    full = len(ec_modes) * len(noise_levels) * len(policies) * trials
+    total = len(range(shard, full, num_shards))  # episodes in this shard
+    print(f"Starting {total} correct episodes (shard {shard + 1}/{num_shards} of {full})...")
 
-    for ec in ERROR_CORRECTIONS:
-        for noise in NOISE_LEVELS:
-            for policy in POLICIES:
-                for trial in range(TRIALS_PER_CONFIG):
-                    seed = SEED_BASE + run_id
+    for ec in ec_modes:
+        for noise in noise_levels:
+            for policy in policies:
+                for trial in range(trials):
+                    # Shard k of n keeps every n-th run_id → same seeds as the full sweep
+                    if run_id % num_shards != shard:
+                        run_id += 1
+                        continue
+                    seed = seed_base + run_id
                     env = QNetLinear5(seed=seed)  # ← NEW INSTANCE + SEED
                     env.reset(src=SRC_NODE, dst=DST_NODE, noise_level=noise, seed=seed)
 
@@ -67,8 +75,9 @@ def main():
                         csv.writer(f).writerow(row)
 
                     run_id += 1
-                    if run_id % 50 == 0:
-                        print(f"Progress: {run_id}/{total}")
+                    done += 1
+                    if done % 50 == 0:
+                        print(f"Progress: {done}/{total}")
 
     print(f"Correct results saved to {outpath.resolve()}")
 